@@ -24,7 +24,6 @@ import logging
 import os
 import pathlib
 import pickle
-import re
 import sys
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'python-devicetree',
@@ -168,13 +167,20 @@ def node_z_path_id(node):
     #
     # This is used throughout this file to generate macros related to
     # the node.
+    #
+    # The identifier is built from the parent's, so that each path
+    # component is only converted once. The parent's identifier is
+    # computed and stored on it here if it hasn't been assigned yet, so
+    # this doesn't depend on the order nodes are visited in.
+
+    parent = node.parent
+    if parent is None:
+        return "N"
 
-    components = ["N"]
-    if node.parent is not None:
-        components.extend(f"S_{str2ident(component)}" for component in
-                          node.path.split("/")[1:])
+    if not hasattr(parent, "z_path_id"):
+        parent.z_path_id = node_z_path_id(parent)
 
-    return "_".join(components)
+    return f"{parent.z_path_id}_S_{str2ident(node.name)}"
 
 def parse_args():
     # Returns parsed command-line arguments
@@ -524,46 +530,45 @@ def write_children(node):
 
     out_comment("Helper macros for child nodes of this node.")
 
-    out_dt_define(f"{node.z_path_id}_CHILD_NUM", len(node.children))
+    # Filter the children and build their node identifiers once, rather
+    # than once per macro
+    child_ids = [f"DT_{child.z_path_id}" for child in node.children.values()]
+    okay_ids = [f"DT_{child.z_path_id}" for child in node.children.values()
+                if child.status == "okay"]
 
-    ok_nodes_num = 0
-    for child in node.children.values():
-        if child.status == "okay":
-            ok_nodes_num = ok_nodes_num + 1
+    out_dt_define(f"{node.z_path_id}_CHILD_NUM", len(child_ids))
 
-    out_dt_define(f"{node.z_path_id}_CHILD_NUM_STATUS_OKAY", ok_nodes_num)
+    out_dt_define(f"{node.z_path_id}_CHILD_NUM_STATUS_OKAY", len(okay_ids))
 
     out_dt_define(f"{node.z_path_id}_FOREACH_CHILD(fn)",
-            " ".join(f"fn(DT_{child.z_path_id})" for child in
-                node.children.values()))
+            " ".join(f"fn({child_id})" for child_id in child_ids))
 
     out_dt_define(f"{node.z_path_id}_FOREACH_CHILD_SEP(fn, sep)",
-            " DT_DEBRACKET_INTERNAL sep ".join(f"fn(DT_{child.z_path_id})"
-            for child in node.children.values()))
+            " DT_DEBRACKET_INTERNAL sep ".join(f"fn({child_id})"
+            for child_id in child_ids))
 
     out_dt_define(f"{node.z_path_id}_FOREACH_CHILD_VARGS(fn, ...)",
-            " ".join(f"fn(DT_{child.z_path_id}, __VA_ARGS__)"
-            for child in node.children.values()))
+            " ".join(f"fn({child_id}, __VA_ARGS__)"
+            for child_id in child_ids))
 
     out_dt_define(f"{node.z_path_id}_FOREACH_CHILD_SEP_VARGS(fn, sep, ...)",
-            " DT_DEBRACKET_INTERNAL sep ".join(f"fn(DT_{child.z_path_id}, __VA_ARGS__)"
-            for child in node.children.values()))
+            " DT_DEBRACKET_INTERNAL sep ".join(f"fn({child_id}, __VA_ARGS__)"
+            for child_id in child_ids))
 
     out_dt_define(f"{node.z_path_id}_FOREACH_CHILD_STATUS_OKAY(fn)",
-            " ".join(f"fn(DT_{child.z_path_id})"
-            for child in node.children.values() if child.status == "okay"))
+            " ".join(f"fn({child_id})" for child_id in okay_ids))
 
     out_dt_define(f"{node.z_path_id}_FOREACH_CHILD_STATUS_OKAY_SEP(fn, sep)",
-            " DT_DEBRACKET_INTERNAL sep ".join(f"fn(DT_{child.z_path_id})"
-            for child in node.children.values() if child.status == "okay"))
+            " DT_DEBRACKET_INTERNAL sep ".join(f"fn({child_id})"
+            for child_id in okay_ids))
 
     out_dt_define(f"{node.z_path_id}_FOREACH_CHILD_STATUS_OKAY_VARGS(fn, ...)",
-            " ".join(f"fn(DT_{child.z_path_id}, __VA_ARGS__)"
-            for child in node.children.values() if child.status == "okay"))
+            " ".join(f"fn({child_id}, __VA_ARGS__)"
+            for child_id in okay_ids))
 
     out_dt_define(f"{node.z_path_id}_FOREACH_CHILD_STATUS_OKAY_SEP_VARGS(fn, sep, ...)",
-            " DT_DEBRACKET_INTERNAL sep ".join(f"fn(DT_{child.z_path_id}, __VA_ARGS__)"
-            for child in node.children.values() if child.status == "okay"))
+            " DT_DEBRACKET_INTERNAL sep ".join(f"fn({child_id}, __VA_ARGS__)"
+            for child_id in okay_ids))
 
 
 def write_status(node):
@@ -1003,7 +1008,12 @@ def write_global_macros(edt):
 def str2ident(s):
     # Converts 's' to a form suitable for (part of) an identifier
 
-    return re.sub('[-,.@/+]', '_', s.lower())
+    return s.lower().translate(STR2IDENT_TABLE)
+
+
+# Translation table for str2ident(). str.translate() is much faster
+# than a regular expression substitution for replacing single characters.
+STR2IDENT_TABLE = str.maketrans("-,.@/+", "______")
 
 
 def list2init(l):
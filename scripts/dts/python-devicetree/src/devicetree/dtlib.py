@@ -18,6 +18,7 @@ import errno
 import os
 import re
 import string
+import struct
 import sys
 import textwrap
 from typing import Any, Dict, Iterable, List, \
@@ -122,7 +123,7 @@ class Node:
         """
         See the class documentation.
         """
-        return self.name.partition("@")[2]
+        return self._name.partition("@")[2]
 
     @property
     def path(self) -> str:
@@ -132,10 +133,11 @@ class Node:
         node_names = []
 
         # This dynamic computation is required to be able to move
-        # nodes in the DT class.
+        # nodes in the DT class. '_name' is read directly, as this runs
+        # for each ancestor of the node.
         cur = self
         while cur.parent:
-            node_names.append(cur.name)
+            node_names.append(cur._name)
             cur = cur.parent
 
         return "/" + "/".join(reversed(node_names))
@@ -151,9 +153,17 @@ class Node:
           for node in dt.root.node_iter():
               ...
         """
-        yield self
-        for node in self.nodes.values():
-            yield from node.node_iter()
+        # Walk the tree with an explicit stack of child iterators. Nested
+        # 'yield from' would pass each node up through one generator per
+        # level of depth.
+        stack = [iter((self,))]
+        while stack:
+            for node in stack[-1]:
+                yield node
+                stack.append(iter(node.nodes.values()))
+                break
+            else:
+                stack.pop()
 
     def _get_prop(self, name: str) -> 'Property':
         # Returns the property named 'name' on the node, creating it if it
@@ -400,8 +410,7 @@ class Property:
                  .format(self.name, self.node.path, self.node.dt.filename,
                          self))
 
-        return [int.from_bytes(self.value[i:i + 4], "big", signed=signed)
-                for i in range(0, len(self.value), 4)]
+        return _unpack_nums(self.value, 4, signed)
 
     def to_bytes(self) -> bytes:
         """
@@ -925,8 +934,11 @@ class DT:
         # in the new DT. Set their parents to None for now and leave
         # them without any properties. We will recursively initialize
         # copies of parents before copies of children next.
-        path2node_copy = {
-            node.path: Node(node.name, None, ret)
+        #
+        # The copies are looked up by original Node object rather than by
+        # path, as Node.path walks up to the root on each access.
+        node2copy = {
+            node: Node(node.name, None, ret)
             for node in self.node_iter()
         }
 
@@ -937,12 +949,10 @@ class DT:
         # type 'bytes', which is immutable. We therefore don't need a
         # copy and can just point to the original data.
 
-        for node in self.node_iter():
-            node_copy = path2node_copy[node.path]
-
+        for node, node_copy in node2copy.items():
             parent = node.parent
             if parent is not None:
-                node_copy.parent = path2node_copy[parent.path]
+                node_copy.parent = node2copy[parent]
 
             prop_name2prop_copy = {
                 prop.name: Property(node_copy, prop.name)
@@ -958,7 +968,7 @@ class DT:
             node_copy.props = prop_name2prop_copy
 
             node_copy.nodes = {
-                child_name: path2node_copy[child_node.path]
+                child_name: node2copy[child_node]
                 for child_name, child_node in node.nodes.items()
             }
 
@@ -970,12 +980,12 @@ class DT:
         # The copied nodes and properties are initialized, so
         # we can finish initializing the copied DT object now.
 
-        ret._root = path2node_copy['/']
+        ret._root = node2copy[self.root]
 
         def copy_node_lookup_table(attr_name):
             original = getattr(self, attr_name)
             copy = {
-                key: path2node_copy[original[key].path]
+                key: node2copy[original[key]]
                 for key in original
             }
             setattr(ret, attr_name, copy)
@@ -986,7 +996,7 @@ class DT:
 
         ret_label2prop = {}
         for label, prop in self.label2prop.items():
-            node_copy = path2node_copy[prop.node.path]
+            node_copy = node2copy[prop.node]
             prop_copy = node_copy.props[prop.name]
             ret_label2prop[label] = prop_copy
         ret.label2prop = ret_label2prop
@@ -994,7 +1004,7 @@ class DT:
         ret_label2prop_offset = {}
         for label, prop_offset in self.label2prop_offset.items():
             prop, offset = prop_offset
-            node_copy = path2node_copy[prop.node.path]
+            node_copy = node2copy[prop.node]
             prop_copy = node_copy.props[prop.name]
             ret_label2prop_offset[label] = (prop_copy, offset)
         ret.label2prop_offset = ret_label2prop_offset
@@ -1855,12 +1865,10 @@ class DT:
         # looking up paths via other aliases while verifying aliases
         alias2node = {}
 
-        alias_re = re.compile("[0-9a-z-]+$")
-
         aliases = self.root.nodes.get("aliases")
         if aliases:
             for prop in aliases.props.values():
-                if not alias_re.match(prop.name):
+                if not _alias_re.match(prop.name):
                     _err(f"/aliases: alias property name '{prop.name}' "
                          "should include only characters from [0-9a-z-]")
 
@@ -2031,13 +2039,28 @@ def to_nums(data: bytes, length: int = 4, signed: bool = False) -> List[int]:
         _err(f"{data!r} is {len(data)} bytes long, "
              f"expected a length that's a a multiple of {length}")
 
-    return [int.from_bytes(data[i:i + length], "big", signed=signed)
-            for i in range(0, len(data), length)]
+    return _unpack_nums(data, length, signed)
 
 #
 # Private helpers
 #
 
+def _unpack_nums(data, length, signed):
+    # Splits 'data' into big-endian numbers of 'length' bytes each. The length
+    # of 'data' must be a multiple of 'length'.
+    #
+    # The usual cell sizes are decoded in one go with the struct module, which
+    # is much faster than converting one slice at a time.
+
+    code = _struct_codes.get(length)
+    if code is None:
+        return [int.from_bytes(data[i:i + length], "big", signed=signed)
+                for i in range(0, len(data), length)]
+
+    if signed:
+        code = code.lower()
+    return list(struct.unpack(f">{len(data) // length}{code}", data))
+
 def _check_is_bytes(data):
     if not isinstance(data, bytes):
         _err(f"'{data}' has type '{type(data).__name__}', expected 'bytes'")
@@ -2099,6 +2122,10 @@ _escape_table = str.maketrans({
     "\f": "\\f",
     "\r": "\\r"})
 
+# Unsigned struct module format codes for numbers of a given size in bytes,
+# see _unpack_nums()
+_struct_codes = {1: "B", 2: "H", 4: "I", 8: "Q"}
+
 # Lexer states
 _DEFAULT = 0
 _EXPECT_PROPNODENAME = 1
@@ -2113,6 +2140,9 @@ _propnodename_re = re.compile(r"\\?([a-zA-Z0-9,._+*#?@-]+)")
 # Node names are more restrictive than property names.
 _nodename_chars = set(string.ascii_letters + string.digits + ',._+-@')
 
+# Valid alias property names, see DT._register_aliases()
+_alias_re = re.compile("[0-9a-z-]+$")
+
 # Misc. tokens that are tried after a property/node name. This is important, as
 # there's overlap with the allowed characters in names.
 _misc_re = re.compile(
@@ -70,19 +70,21 @@ bindings_from_paths() helper function.
 from collections import defaultdict
 from copy import deepcopy
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, Iterable, List, NoReturn, \
-    Optional, Set, TYPE_CHECKING, Tuple, Union
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, \
+    NoReturn, Optional, Set, TYPE_CHECKING, Tuple, Union
 import logging
 import os
 import re
+import struct
 
 import yaml
 try:
     # Use the C LibYAML parser if available, rather than the Python parser.
-    # This makes e.g. gen_defines.py more than twice as fast.
-    from yaml import CLoader as Loader
+    # This makes e.g. gen_defines.py more than twice as fast. Bindings are
+    # plain data, so the safe loaders are enough.
+    from yaml import CSafeLoader as SafeLoader
 except ImportError:
-    from yaml import Loader     # type: ignore
+    from yaml import SafeLoader     # type: ignore
 
 from devicetree.dtlib import DT, DTError, to_num, to_nums, Type
 from devicetree.dtlib import Node as dtlib_Node
@@ -165,7 +167,8 @@ class Binding:
                  raw: Any = None, require_compatible: bool = True,
                  require_description: bool = True,
                  inc_allowlist: Optional[List[str]] = None,
-                 inc_blocklist: Optional[List[str]] = None):
+                 inc_blocklist: Optional[List[str]] = None,
+                 *, yaml_cache: Optional[Dict[str, Any]] = None):
         """
         Binding constructor.
 
@@ -199,6 +202,13 @@ class Binding:
 
         inc_blocklist:
           The property-blocklist filter set by including bindings.
+
+        yaml_cache:
+          Optional dictionary for caching parsed include files by path.
+          Pass the same dictionary when creating several Binding objects
+          in one go, so that files included by many of them (like
+          base.yaml) are only parsed once. The files are assumed not to
+          change while the dictionary is in use.
         """
         self.path: Optional[str] = path
         self._fname2path: Dict[str, str] = fname2path
@@ -209,8 +219,10 @@ class Binding:
         if raw is None:
             if path is None:
                 _err("you must provide either a 'path' or a 'raw' argument")
-            with open(path, encoding="utf-8") as f:
-                raw = yaml.load(f, Loader=_BindingLoader)
+            raw = _load_binding_yaml(path)
+
+        if yaml_cache is None:
+            yaml_cache = {}
 
         # Get the properties this binding modifies
         # before we merge the included ones.
@@ -226,7 +238,8 @@ class Binding:
         # Merge any included files into self.raw. This also pulls in
         # inherited child binding definitions, so it has to be done
         # before initializing those.
-        self.raw: dict = self._merge_includes(raw, self.path)
+        self.raw: dict = self._merge_includes(raw, self.path,
+                                              yaml_cache=yaml_cache)
 
         # Recursively initialize any child bindings. These don't
         # require a 'compatible' or 'description' to be well defined,
@@ -239,7 +252,8 @@ class Binding:
                 path, fname2path,
                 raw=raw["child-binding"],
                 require_compatible=False,
-                require_description=False)
+                require_description=False,
+                yaml_cache=yaml_cache)
         else:
             self.child_binding = None
 
@@ -292,14 +306,16 @@ class Binding:
         "See the class docstring"
         return self.raw.get('on-bus')
 
-    def _merge_includes(self, raw: dict, binding_path: Optional[str]) -> dict:
+    def _merge_includes(self, raw: dict, binding_path: Optional[str],
+                        *, yaml_cache: Dict[str, Any]) -> dict:
         # Constructor helper. Merges included files in
         # 'raw["include"]' into 'raw' using 'self._include_paths' as a
         # source of include files, removing the "include" key while
         # doing so.
         #
         # This treats 'binding_path' as the binding file being built up
-        # and uses it for error messages.
+        # and uses it for error messages. Included files are loaded
+        # through 'yaml_cache', see the constructor docstring.
 
         if "include" not in raw:
             return raw
@@ -316,7 +332,8 @@ class Binding:
             # Simple scalar string case
             # Load YAML file and register property specs into prop2specs.
             inc_raw = self._load_raw(include, self._inc_allowlist,
-                                     self._inc_blocklist)
+                                     self._inc_blocklist,
+                                     yaml_cache=yaml_cache)
 
             _merge_props(merged, inc_raw, None, binding_path,  False)
         elif isinstance(include, list):
@@ -325,7 +342,8 @@ class Binding:
                 if isinstance(elem, str):
                     # Load YAML file and register property specs into prop2specs.
                     inc_raw = self._load_raw(elem, self._inc_allowlist,
-                                             self._inc_blocklist)
+                                             self._inc_blocklist,
+                                             yaml_cache=yaml_cache)
 
                     _merge_props(merged, inc_raw, None, binding_path, False)
                 elif isinstance(elem, dict):
@@ -363,7 +381,8 @@ class Binding:
                     # into prop2specs.
                     contents = self._load_raw(name,
                                               allowlist, blocklist,
-                                              child_filter)
+                                              child_filter,
+                                              yaml_cache=yaml_cache)
 
                     _merge_props(merged, contents, None, binding_path, False)
                 else:
@@ -388,7 +407,8 @@ class Binding:
     def _load_raw(self, fname: str,
                   allowlist: Optional[List[str]] = None,
                   blocklist: Optional[List[str]] = None,
-                  child_filter: Optional[dict] = None) -> dict:
+                  child_filter: Optional[dict] = None,
+                  *, yaml_cache: Dict[str, Any]) -> dict:
         # Returns the contents of the binding given by 'fname' after merging
         # any bindings it lists in 'include:' into it, according to the given
         # property filters.
@@ -401,10 +421,9 @@ class Binding:
         if not path:
             _err(f"'{fname}' not found")
 
-        with open(path, encoding="utf-8") as f:
-            contents = yaml.load(f, Loader=_BindingLoader)
-            if not isinstance(contents, dict):
-                _err(f'{path}: invalid contents, expected a mapping')
+        contents = _load_binding_yaml(path, yaml_cache)
+        if not isinstance(contents, dict):
+            _err(f'{path}: invalid contents, expected a mapping')
 
         # Apply constraints to included YAML contents.
         _filter_properties(contents,
@@ -412,13 +431,15 @@ class Binding:
                            child_filter, self.path)
 
         # Register included property specs.
-        self._add_included_prop2specs(fname, contents, allowlist, blocklist)
+        self._add_included_prop2specs(fname, contents, allowlist, blocklist,
+                                      yaml_cache=yaml_cache)
 
-        return self._merge_includes(contents, path)
+        return self._merge_includes(contents, path, yaml_cache=yaml_cache)
 
     def _add_included_prop2specs(self, fname: str, contents: dict,
                                  allowlist: Optional[List[str]] = None,
-                                 blocklist: Optional[List[str]] = None) -> None:
+                                 blocklist: Optional[List[str]] = None,
+                                 *, yaml_cache: Dict[str, Any]) -> None:
         # Registers the properties specified by an included binding file
         # into the properties this binding supports/requires (aka prop2specs).
         #
@@ -449,6 +470,7 @@ class Binding:
             # Recursively pass filters to included bindings.
             inc_allowlist=allowlist,
             inc_blocklist=blocklist,
+            yaml_cache=yaml_cache,
         )
 
         for prop, spec in inc_binding.prop2specs.items():
@@ -664,8 +686,7 @@ class PropertySpec:
             else:
                 # Saving _as_tokens here lets us reuse it in
                 # enum_upper_tokenizable.
-                self._as_tokens = [re.sub(_NOT_ALPHANUM_OR_UNDERSCORE,
-                                          '_', value)
+                self._as_tokens = [str_as_token(value)
                                    for value in self.enum]
                 self._enum_tokenizable = (len(self._as_tokens) ==
                                           len(set(self._as_tokens)))
@@ -699,6 +720,42 @@ class PropertySpec:
         "See the class docstring"
         return self._raw.get("required", False)
 
+    def _enum_contains(self, val: 'PropertyValType') -> bool:
+        # Returns True if 'val' is in self.enum. Every node with the binding
+        # checks its value against the enum, so a set is built for it once.
+
+        if not hasattr(self, '_enum_set'):
+            try:
+                self._enum_set: Optional[FrozenSet] = frozenset(self.enum or ())
+            except TypeError:
+                # Unhashable enum values
+                self._enum_set = None
+
+        if self._enum_set is None or isinstance(val, list):
+            return val in self.enum # type: ignore
+        return val in self._enum_set
+
+    def _absent_val(self) -> 'PropertyValType':
+        # Returns the value for the property on nodes that don't have it. This
+        # is the binding's default, if any, or else False for booleans and
+        # None for other types. Computed once, as every node with the binding
+        # that lacks the property needs it.
+
+        if not hasattr(self, '_absent_val_cache'):
+            default = self.default
+            if default is not None:
+                # YAML doesn't have a native format for byte arrays. We need
+                # to convert those from an array like [0x12, 0x34, ...]. The
+                # format has already been checked in _check_prop_by_type().
+                if self.type == "uint8-array":
+                    default = bytes(default) # type: ignore
+                self._absent_val_cache: 'PropertyValType' = default
+            else:
+                self._absent_val_cache = (False if self.type == "boolean"
+                                          else None)
+
+        return self._absent_val_cache
+
     @property
     def deprecated(self) -> bool:
         "See the class docstring"
@@ -828,6 +885,10 @@ class Register:
       The length of the register in bytes
     """
 
+    # Many instances of this class are created, so do without a __dict__.
+    # The same goes for the other small dataclasses below.
+    __slots__ = ('node', 'name', 'addr', 'size')
+
     node: 'Node'
     name: Optional[str]
     addr: Optional[int]
@@ -866,6 +927,10 @@ class Range:
       The size of the range in the child address space, or None if the
       child's #size-cells equals 0.
     """
+    __slots__ = ('node', 'child_bus_cells', 'child_bus_addr',
+                 'parent_bus_cells', 'parent_bus_addr', 'length_cells',
+                 'length')
+
     node: 'Node'
     child_bus_cells: int
     child_bus_addr: Optional[int]
@@ -907,6 +972,8 @@ class ControllerAndData:
     basename:
       Basename for the controller when supporting named cells
     """
+    __slots__ = ('node', 'controller', 'data', 'name', 'basename')
+
     node: 'Node'
     controller: 'Node'
     data: dict
@@ -939,6 +1006,8 @@ class PinCtrl:
           pinctrl-0 = <&state_1 &state_2>;
     """
 
+    __slots__ = ('node', 'name', 'conf_nodes')
+
     node: 'Node'
     name: Optional[str]
     conf_nodes: List['Node']
@@ -1125,16 +1194,11 @@ class Node:
 
         # TODO: Return a plain string here later, like dtlib.Node.unit_addr?
 
-        # PCI devices use a different node name format (e.g. "pcie@1,0")
-        if "@" not in self.name or self.is_pci_device:
-            return None
-
-        try:
-            addr = int(self.name.split("@", 1)[1], 16)
-        except ValueError:
-            _err(f"{self!r} has non-hex unit address")
-
-        return _translate(addr, self._node)
+        # The devicetree doesn't change after initialization, so the
+        # translated address is computed just once.
+        if not hasattr(self, '_unit_addr'):
+            self._unit_addr: Optional[int] = self._translated_unit_addr()
+        return self._unit_addr
 
     @property
     def description(self) -> Optional[str]:
@@ -1146,7 +1210,12 @@ class Node:
     @property
     def path(self) ->  str:
         "See the class docstring"
-        return self._node.path
+        # dtlib rebuilds the path from the node's ancestors on each access,
+        # since nodes can be moved there. That doesn't happen once the EDT
+        # has been created, so compute it once.
+        if not hasattr(self, '_path'):
+            self._path: str = self._node.path
+        return self._path
 
     @property
     def label(self) -> Optional[str]:
@@ -1168,12 +1237,18 @@ class Node:
     @property
     def children(self) -> Dict[str, 'Node']:
         "See the class docstring"
-        # Could be initialized statically too to preserve identity, but not
-        # sure if needed. Parent nodes being initialized before their children
-        # would need to be kept in mind.
-        return {name: self.edt._node2enode[node]
+        # Built on first access rather than in __init__(), since parent
+        # nodes are initialized before their children. Clients like
+        # gen_defines.py read this many times per node, so it's cached
+        # after that.
+        if not hasattr(self, '_children'):
+            node2enode = self.edt._node2enode
+            self._children: Dict[str, Node] = {
+                name: node2enode[node]
                 for name, node in self._node.nodes.items()}
 
+        return self._children
+
     def child_index(self, node) -> int:
         """Get the index of *node* in self.children.
         Raises KeyError if the argument is not a child of this node.
@@ -1183,12 +1258,14 @@ class Node:
             # method is callable to handle parents needing to be
             # initialized before their chidlren. By the time we
             # return from __init__, 'self.children' is callable.
-            self._child2index: Dict[str, int] = {}
-            for index, child_path in enumerate(child.path for child in
-                                               self.children.values()):
-                self._child2index[child_path] = index
+            #
+            # Children are keyed by identity rather than by path, which
+            # would need to be rebuilt from the node's ancestors.
+            self._child2index: Dict[Node, int] = {
+                child: index
+                for index, child in enumerate(self.children.values())}
 
-        return self._child2index[node.path]
+        return self._child2index[node]
 
     @property
     def required_by(self) -> List['Node']:
@@ -1203,17 +1280,22 @@ class Node:
     @property
     def status(self) -> str:
         "See the class docstring"
-        status = self._node.props.get("status")
+        # Cached, as clients like gen_defines.py check the status of the
+        # same node many times
+        if not hasattr(self, '_status'):
+            status = self._node.props.get("status")
 
-        if status is None:
-            as_string = "okay"
-        else:
-            as_string = status.to_string()
+            if status is None:
+                as_string = "okay"
+            else:
+                as_string = status.to_string()
+
+            if as_string == "ok":
+                as_string = "okay"
 
-        if as_string == "ok":
-            as_string = "okay"
+            self._status: str = as_string
 
-        return as_string
+        return self._status
 
     @property
     def read_only(self) -> bool:
@@ -1223,8 +1305,7 @@ class Node:
     @property
     def aliases(self) -> List[str]:
         "See the class docstring"
-        return [alias for alias, node in self._node.dt.alias2node.items()
-                if node is self._node]
+        return list(self.edt._node2aliases.get(self._node, []))
 
     @property
     def buses(self) -> List[str]:
@@ -1330,6 +1411,20 @@ class Node:
             binding = "no binding"
         return f"<Node {self.path} in '{self.edt.dts_path}', {binding}>"
 
+    def _translated_unit_addr(self) -> Optional[int]:
+        # Returns the value for self.unit_addr
+
+        # PCI devices use a different node name format (e.g. "pcie@1,0")
+        if "@" not in self.name or self.is_pci_device:
+            return None
+
+        try:
+            addr = int(self.name.split("@", 1)[1], 16)
+        except ValueError:
+            _err(f"{self!r} has non-hex unit address")
+
+        return _translate(addr, self._node)
+
     def _init_binding(self) -> None:
         # Initializes Node.matching_compat, Node._binding, and
         # Node.binding_path.
@@ -1348,6 +1443,7 @@ class Node:
 
         if self.compats:
             on_buses = self.on_buses
+            compat2binding = self.edt._compat2binding
 
             for compat in self.compats:
                 # When matching, respect the order of the 'compatible' entries,
@@ -1358,14 +1454,13 @@ class Node:
                 binding = None
 
                 for bus in on_buses:
-                    if (compat, bus) in self.edt._compat2binding:
-                        binding = self.edt._compat2binding[compat, bus]
+                    binding = compat2binding.get((compat, bus))
+                    if binding is not None:
                         break
 
-                if not binding:
-                    if (compat, None) in self.edt._compat2binding:
-                        binding = self.edt._compat2binding[compat, None]
-                    else:
+                if binding is None:
+                    binding = compat2binding.get((compat, None))
+                    if binding is None:
                         continue
 
                 self.binding_path = binding.path
@@ -1400,31 +1495,11 @@ class Node:
             'properties': {},
         }
         for name, prop in self._node.props.items():
-            pp: Dict[str, str] = {}
-            if prop.type == Type.EMPTY:
-                pp["type"] = "boolean"
-            elif prop.type == Type.BYTES:
-                pp["type"] = "uint8-array"
-            elif prop.type == Type.NUM:
-                pp["type"] = "int"
-            elif prop.type == Type.NUMS:
-                pp["type"] = "array"
-            elif prop.type == Type.STRING:
-                pp["type"] = "string"
-            elif prop.type == Type.STRINGS:
-                pp["type"] = "string-array"
-            elif prop.type == Type.PHANDLE:
-                pp["type"] = "phandle"
-            elif prop.type == Type.PHANDLES:
-                pp["type"] = "phandles"
-            elif prop.type == Type.PHANDLES_AND_NUMS:
-                pp["type"] = "phandle-array"
-            elif prop.type == Type.PATH:
-                pp["type"] = "path"
-            else:
+            prop_type = _DT_TYPE2BINDING_TYPE.get(prop.type)
+            if prop_type is None:
                 _err(f"cannot infer binding from property: {prop} "
                      f"with type {prop.type!r}")
-            raw['properties'][name] = pp
+            raw['properties'][name] = {"type": prop_type}
 
         # Set up Node state.
         self.binding_path = None
@@ -1495,8 +1570,9 @@ class Node:
                 if name not in _DEFAULT_PROP_SPECS:
                     continue
                 prop_spec = _DEFAULT_PROP_SPECS[name]
-                val = self._prop_val(name, prop_spec.type, False, False, None,
-                                     None, err_on_deprecated)
+                val = self._prop_val(name, prop_spec.type, False, False,
+                                     prop_spec._absent_val(), None,
+                                     err_on_deprecated)
                 self.props[name] = Property(prop_spec, val, self)
 
     def _init_prop(self, prop_spec: PropertySpec,
@@ -1510,7 +1586,7 @@ class Node:
             _err(f"'{name}' in {self.binding_path} lacks 'type'")
 
         val = self._prop_val(name, prop_type, prop_spec.deprecated,
-                             prop_spec.required, prop_spec.default,
+                             prop_spec.required, prop_spec._absent_val(),
                              prop_spec.specifier_space, err_on_deprecated)
 
         if val is None:
@@ -1519,7 +1595,7 @@ class Node:
             return
 
         enum = prop_spec.enum
-        if enum and val not in enum:
+        if enum and not prop_spec._enum_contains(val):
             _err(f"value of property '{name}' on {self.path} in "
                  f"{self.edt.dts_path} ({val!r}) is not in 'enum' list in "
                  f"{self.binding_path} ({enum!r})")
@@ -1540,7 +1616,7 @@ class Node:
 
     def _prop_val(self, name: str, prop_type: str,
                   deprecated: bool, required: bool,
-                  default: PropertyValType,
+                  absent_val: PropertyValType,
                   specifier_space: Optional[str],
                   err_on_deprecated: bool) -> PropertyValType:
         # _init_prop() helper for getting the property's value
@@ -1557,9 +1633,9 @@ class Node:
         # required:
         #   True if the property is required to exist
         #
-        # default:
-        #   Default value to use when the property doesn't exist, or None if
-        #   the binding doesn't give a default value
+        # absent_val:
+        #   Value to use when the property doesn't exist, from
+        #   PropertySpec._absent_val()
         #
         # specifier_space:
         #   Property specifier-space from binding (if prop_type is "phandle-array")
@@ -1583,16 +1659,7 @@ class Node:
                 _err(f"'{name}' is marked as required in 'properties:' in "
                      f"{self.binding_path}, but does not appear in {node!r}")
 
-            if default is not None:
-                # YAML doesn't have a native format for byte arrays. We need to
-                # convert those from an array like [0x12, 0x34, ...]. The
-                # format has already been checked in
-                # _check_prop_by_type().
-                if prop_type == "uint8-array":
-                    return bytes(default) # type: ignore
-                return default
-
-            return False if prop_type == "boolean" else None
+            return absent_val
 
         if prop_type == "boolean":
             if prop.type != Type.EMPTY:
@@ -1601,26 +1668,17 @@ class Node:
                      "('{0};')".format(name, node, self.binding_path, prop))
             return True
 
-        if prop_type == "int":
-            return prop.to_num()
-
-        if prop_type == "array":
-            return prop.to_nums()
-
-        if prop_type == "uint8-array":
-            return prop.to_bytes()
-
-        if prop_type == "string":
-            return prop.to_string()
-
-        if prop_type == "string-array":
-            return prop.to_strings()
+        # Types that map directly to a dtlib.Property conversion method
+        to_val = _PROP_TYPE2TO_VAL.get(prop_type)
+        if to_val is not None:
+            return to_val(prop)
 
         if prop_type == "phandle":
             return self.edt._node2enode[prop.to_node()]
 
         if prop_type == "phandles":
-            return [self.edt._node2enode[node] for node in prop.to_nodes()]
+            node2enode = self.edt._node2enode
+            return [node2enode[node] for node in prop.to_nodes()]
 
         if prop_type == "phandle-array":
             # This type is a bit high-level for dtlib as it involves
@@ -1648,7 +1706,21 @@ class Node:
     def _check_undeclared_props(self) -> None:
         # Checks that all properties are declared in the binding
 
+        if TYPE_CHECKING:
+            assert self._binding
+
+        # Most properties are declared, so narrow them down with a single set
+        # difference before checking them one by one
+        undeclared = self._node.props.keys() - self._binding.prop2specs.keys()
+        if not undeclared:
+            return
+
+        # Go through the properties in order, so that any error is about the
+        # first undeclared one
         for prop_name in self._node.props:
+            if prop_name not in undeclared:
+                continue
+
             # Allow a few special properties to not be declared in the binding
             if prop_name.endswith("-controller") or \
                prop_name.startswith("#") or \
@@ -1657,13 +1729,9 @@ class Node:
                    "interrupt-parent", "interrupts-extended", "device_type"}:
                 continue
 
-            if TYPE_CHECKING:
-                assert self._binding
-
-            if prop_name not in self._binding.prop2specs:
-                _err(f"'{prop_name}' appears in {self._node.path} in "
-                     f"{self.edt.dts_path}, but is not declared in "
-                     f"'properties:' in {self.binding_path}")
+            _err(f"'{prop_name}' appears in {self._node.path} in "
+                 f"{self.edt.dts_path}, but is not declared in "
+                 f"'properties:' in {self.binding_path}")
 
     def _init_ranges(self) -> None:
         # Initializes self.ranges
@@ -1767,9 +1835,11 @@ class Node:
 
         node = self._node
 
-        # pinctrl-<index> properties
+        # pinctrl-<index> properties. The startswith() check is a cheap
+        # way to rule out most properties before running the regex.
         pinctrl_props = [prop for name, prop in node.props.items()
-                         if re.match("pinctrl-[0-9]+", name)]
+                         if name.startswith("pinctrl-") and
+                            _PINCTRL_PROP_RE.match(name)]
         # Sort by index
         pinctrl_props.sort(key=lambda prop: prop.name)
 
@@ -1779,14 +1849,14 @@ class Node:
                 _err(f"missing 'pinctrl-{i}' property on {node!r} "
                      "- indices should be contiguous and start from zero")
 
+        node2enode = self.edt._node2enode
         self.pinctrls = []
         for prop in pinctrl_props:
             # We'll fix up the names below.
             self.pinctrls.append(PinCtrl(
                 node=self,
                 name=None,
-                conf_nodes=[self.edt._node2enode[node]
-                            for node in prop.to_nodes()]))
+                conf_nodes=[node2enode[node] for node in prop.to_nodes()]))
 
         _add_names(node, "pinctrl", self.pinctrls)
 
@@ -2055,11 +2125,13 @@ class EDT:
         self._compat2binding: Dict[Tuple[str, Optional[str]], Binding] = {}
         self._graph: Graph = Graph()
         self._binding_paths: List[str] = _binding_paths(self.bindings_dirs)
-        self._binding_fname2path: Dict[str, str] = {
-            os.path.basename(path): path
-            for path in self._binding_paths
-        }
+        # Maps binding file names to paths, for resolving 'include:'s. Built
+        # by _binding() on first use, as it's not needed when no binding
+        # matches.
+        self._binding_fname2path: Optional[Dict[str, str]] = None
         self._node2enode: Dict[dtlib_Node, Node] = {}
+        self._path2node: Dict[str, Node] = {}
+        self._node2aliases: Dict[dtlib_Node, List[str]] = defaultdict(list)
 
         if dts is not None:
             try:
@@ -2068,12 +2140,16 @@ class EDT:
                 raise EDTError(e) from e
             self._finish_init()
 
-    def _finish_init(self) -> None:
+    def _finish_init(self, init_compat2binding: bool = True) -> None:
         # This helper exists to make the __deepcopy__() implementation
         # easier to keep in sync with __init__().
-        _check_dt(self._dt)
+        #
+        # If 'init_compat2binding' is False, self._compat2binding must
+        # already have been set up by the caller.
+        dt_compats = _check_dt(self._dt)
 
-        self._init_compat2binding()
+        if init_compat2binding:
+            self._init_compat2binding(dt_compats)
         self._init_nodes()
         self._init_graph()
         self._init_luts()
@@ -2085,6 +2161,12 @@ class EDT:
         Returns the Node at the DT path or alias 'path'. Raises EDTError if the
         path or alias doesn't exist.
         """
+        # Fast path for plain node paths. Aliases and non-canonical paths
+        # (e.g. with a trailing '/') are left to dtlib.
+        node = self._path2node.get(path)
+        if node is not None:
+            return node
+
         try:
             return self._node2enode[self._dt.get_node(path)]
         except DTError as e:
@@ -2094,12 +2176,13 @@ class EDT:
     def chosen_nodes(self) -> Dict[str, Node]:
         ret: Dict[str, Node] = {}
 
-        try:
-            chosen = self._dt.get_node("/chosen")
-        except DTError:
+        # Look the node up in _path2node rather than asking dtlib, which
+        # raises an exception for the common case of there being no /chosen
+        chosen = self._path2node.get("/chosen")
+        if chosen is None:
             return ret
 
-        for name, prop in chosen.props.items():
+        for name, prop in chosen._node.props.items():
             try:
                 node = prop.to_path()
             except DTError:
@@ -2115,7 +2198,20 @@ class EDT:
         Returns the Node pointed at by the property named 'name' in /chosen, or
         None if the property is missing
         """
-        return self.chosen_nodes.get(name)
+        # Like chosen_nodes, but only converts the requested property
+        chosen = self._path2node.get("/chosen")
+        if chosen is None:
+            return None
+
+        prop = chosen._node.props.get(name)
+        if prop is None:
+            return None
+
+        try:
+            return self._node2enode[prop.to_path()]
+        except DTError:
+            # DTS value is not phandle or string, or path doesn't exist
+            return None
 
     @property
     def dts_source(self) -> str:
@@ -2143,7 +2239,15 @@ class EDT:
         )
         ret.dts_path = self.dts_path
         ret._dt = deepcopy(self._dt, memo)
-        ret._finish_init()
+
+        # The copy has the same binding directories and compatibles, so it
+        # would load the same bindings. Copying them is much cheaper than
+        # parsing the YAML files again.
+        if self._binding_fname2path is not None:
+            ret._binding_fname2path = deepcopy(self._binding_fname2path, memo)
+        ret._compat2binding = deepcopy(self._compat2binding, memo)
+
+        ret._finish_init(init_compat2binding=False)
         return ret
 
     @property
@@ -2153,11 +2257,11 @@ class EDT:
         except Exception as e:
             raise EDTError(e)
 
-    def _process_properties_r(self, root_node, props_node):
+    def _process_properties_r(self, deps, props_node):
         """
-        Process props_node properties for dependencies, and add those as
-        dependencies of root_node. Then walk through all the props_node
-        children and do the same recursively, maintaining the same root_node.
+        Process props_node properties for dependencies, and append those to
+        the deps list. Then walk through all the props_node children and do
+        the same recursively, appending to the same deps list.
 
         This ensures that on a node with child nodes, the parent node includes
         the dependencies of all the child nodes as well as its own.
@@ -2166,12 +2270,11 @@ class EDT:
         # 'phandles', or 'phandle-array' property values.
         for prop in props_node.props.values():
             if prop.type == 'phandle':
-                self._graph.add_edge(root_node, prop.val)
+                deps.append(prop.val)
             elif prop.type == 'phandles':
                 if TYPE_CHECKING:
                     assert isinstance(prop.val, list)
-                for phandle_node in prop.val:
-                    self._graph.add_edge(root_node, phandle_node)
+                deps.extend(prop.val)
             elif prop.type == 'phandle-array':
                 if TYPE_CHECKING:
                     assert isinstance(prop.val, list)
@@ -2180,12 +2283,12 @@ class EDT:
                         continue
                     if TYPE_CHECKING:
                         assert isinstance(cd, ControllerAndData)
-                    self._graph.add_edge(root_node, cd.controller)
+                    deps.append(cd.controller)
 
         # A Node depends on whatever supports the interrupts it
         # generates.
         for intr in props_node.interrupts:
-            self._graph.add_edge(root_node, intr.controller)
+            deps.append(intr.controller)
 
         # If the binding defines child bindings, link the child properties to
         # the root_node as well.
@@ -2194,14 +2297,16 @@ class EDT:
                 if "compatible" in child.props:
                     # Not a child node, normal node on a different binding.
                     continue
-                self._process_properties_r(root_node, child)
+                self._process_properties_r(deps, child)
 
     def _process_properties(self, node):
         """
         Add node dependencies based on own as well as child node properties,
         start from the node itself.
         """
-        self._process_properties_r(node, node)
+        deps = []
+        self._process_properties_r(deps, node)
+        self._graph.add_edges(node, deps)
 
     def _init_graph(self) -> None:
         # Constructs a graph of dependencies between Node instances,
@@ -2212,17 +2317,17 @@ class EDT:
         # first time the scc_order property is read.
 
         for node in self.nodes:
-            # Always insert root node
-            if not node.parent:
+            # A Node always depends on its parent. Always insert the root
+            # node, which has none.
+            parent = node.parent
+            if parent is None:
                 self._graph.add_node(node)
-
-            # A Node always depends on its parent.
-            for child in node.children.values():
-                self._graph.add_edge(child, node)
+            else:
+                self._graph.add_edge(node, parent)
 
             self._process_properties(node)
 
-    def _init_compat2binding(self) -> None:
+    def _init_compat2binding(self, dt_compats: Set[str]) -> None:
         # Creates self._compat2binding, a dictionary that maps
         # (<compatible>, <bus>) tuples (both strings) to Binding objects.
         #
@@ -2237,22 +2342,25 @@ class EDT:
         # self._compat2binding["company,notonbus", None] is the Binding.
         #
         # Only bindings for 'compatible' strings that appear in the devicetree
-        # are loaded.
+        # are loaded. 'dt_compats' is the set of those strings, as returned by
+        # _check_dt().
 
-        dt_compats = _dt_compats(self._dt)
-        # Searches for any 'compatible' string mentioned in the devicetree
-        # files, with a regex
-        dt_compats_search = re.compile(
-            "|".join(re.escape(compat) for compat in dt_compats)
-        ).search
+        # Parsed include files, shared by the Binding objects created
+        # below. See the Binding constructor.
+        yaml_cache: Dict[str, Any] = {}
 
         for binding_path in self._binding_paths:
             with open(binding_path, encoding="utf-8") as f:
                 contents = f.read()
 
             # As an optimization, skip parsing files that don't contain any of
-            # the .dts 'compatible' strings, which should be reasonably safe
-            if not dt_compats_search(contents):
+            # the .dts 'compatible' strings, which should be reasonably safe.
+            #
+            # The file is split into runs of the characters allowed in
+            # 'compatible' strings, which are then looked up in the set. This
+            # is much faster than searching for a regex alternation of all
+            # the strings, and a binding's 'compatible' is always a full run.
+            if dt_compats.isdisjoint(_COMPAT_CHARS_RE.findall(contents)):
                 continue
 
             # Load the binding and check that it actually matches one of the
@@ -2271,7 +2379,8 @@ class EDT:
 
             # Convert the raw data to a Binding object, erroring out
             # if necessary.
-            binding = self._binding(raw, binding_path, dt_compats)
+            binding = self._binding(raw, binding_path, dt_compats,
+                                    yaml_cache)
 
             # Register the binding in self._compat2binding, along with
             # any child bindings that have their own compatibles.
@@ -2283,7 +2392,8 @@ class EDT:
     def _binding(self,
                  raw: Optional[dict],
                  binding_path: str,
-                 dt_compats: Set[str]) -> Optional[Binding]:
+                 dt_compats: Set[str],
+                 yaml_cache: Dict[str, Any]) -> Optional[Binding]:
         # Convert a 'raw' binding from YAML to a Binding object and return it.
         #
         # Error out if the raw data looks like an invalid binding.
@@ -2302,45 +2412,62 @@ class EDT:
             # Not a compatible we care about.
             return None
 
+        if self._binding_fname2path is None:
+            self._binding_fname2path = {
+                os.path.basename(path): path
+                for path in self._binding_paths
+            }
+
         # Initialize and return the Binding object.
-        return Binding(binding_path, self._binding_fname2path, raw=raw)
+        return Binding(binding_path, self._binding_fname2path, raw=raw,
+                       yaml_cache=yaml_cache)
 
     def _register_binding(self, binding: Binding) -> None:
         # Do not allow two different bindings to have the same
         # 'compatible:'/'on-bus:' combo
         if TYPE_CHECKING:
             assert binding.compatible
-        old_binding = self._compat2binding.get((binding.compatible,
-                                                binding.on_bus))
-        if old_binding:
+
+        # Register the binding, unless the key is already taken, with a
+        # single dictionary operation
+        old_binding = self._compat2binding.setdefault(
+            (binding.compatible, binding.on_bus), binding)
+        if old_binding is not binding:
             msg = (f"both {old_binding.path} and {binding.path} have "
                    f"'compatible: {binding.compatible}'")
             if binding.on_bus is not None:
                 msg += f" and 'on-bus: {binding.on_bus}'"
             _err(msg)
 
-        # Register the binding.
-        self._compat2binding[binding.compatible, binding.on_bus] = binding
-
     def _init_nodes(self) -> None:
         # Creates a list of edtlib.Node objects from the dtlib.Node objects, in
         # self.nodes
 
+        # Bound to locals, as this loop runs for every node
+        nodes = self.nodes
+        node2enode = self._node2enode
+        path2node = self._path2node
+        fixed_partitions_no_bus = self._fixed_partitions_no_bus
+
         for dt_node in self._dt.node_iter():
             # Warning: We depend on parent Nodes being created before their
             # children. This is guaranteed by node_iter().
-            if "compatible" in dt_node.props:
-                compats = dt_node.props["compatible"].to_strings()
+            compat_prop = dt_node.props.get("compatible")
+            if compat_prop is not None:
+                compats = compat_prop.to_strings()
             else:
                 compats = []
             node = Node(dt_node, self, compats)
-            node.bus_node = node._bus_node(self._fixed_partitions_no_bus)
+            node.bus_node = node._bus_node(fixed_partitions_no_bus)
             node._init_binding()
             node._init_regs()
             node._init_ranges()
 
-            self.nodes.append(node)
-            self._node2enode[dt_node] = node
+            nodes.append(node)
+            node2enode[dt_node] = node
+            # Node.path caches the path, so this also saves computing it
+            # again later
+            path2node[node.path] = node
 
         for node in self.nodes:
             # These depend on all Node objects having been created, because
@@ -2364,25 +2491,38 @@ class EDT:
     def _init_luts(self) -> None:
         # Initialize node lookup tables (LUTs).
 
+        # Inverse of dtlib.DT.alias2node, so that Node.aliases doesn't
+        # need to scan every alias
+        for alias, dt_node in self._dt.alias2node.items():
+            self._node2aliases[dt_node].append(alias)
+
+        # Compatibles that have already been validated. The checks below
+        # only depend on the compatible, so each one is checked just once.
+        checked_compats: Set[str] = set()
+
+        compat2nodes = self.compat2nodes
+        compat2okay = self.compat2okay
+
         for node in self.nodes:
             for label in node.labels:
                 self.label2node[label] = node
 
+            # The status is the same for all of the node's compatibles
+            okay = node.status == "okay"
+
             for compat in node.compats:
-                self.compat2nodes[compat].append(node)
+                compat2nodes[compat].append(node)
 
-                if node.status == "okay":
-                    self.compat2okay[compat].append(node)
+                if okay:
+                    compat2okay[compat].append(node)
 
-                if compat in self.compat2vendor:
+                if compat in checked_compats:
                     continue
 
-                # The regular expression comes from dt-schema.
-                compat_re = r'^[a-zA-Z][a-zA-Z0-9,+\-._]+$'
-                if not re.match(compat_re, compat):
+                if not _COMPAT_RE.match(compat):
                     _err(f"node '{node.path}' compatible '{compat}' "
                          'must match this regular expression: '
-                         f"'{compat_re}'")
+                         f"'{_COMPAT_RE.pattern}'")
 
                 if ',' in compat and self._vendor_prefixes:
                     vendor, model = compat.split(',', 1)
@@ -2391,8 +2531,12 @@ class EDT:
                         self.compat2model[compat] = model
 
                     # As an exception, the root node can have whatever
-                    # compatibles it wants. Other nodes get checked.
-                    elif node.path != '/':
+                    # compatibles it wants. Other nodes get checked, so the
+                    # compatible isn't marked as checked here.
+                    elif node.path == '/':
+                        continue
+
+                    else:
                         if self._werror:
                             handler_fn: Any = _err
                         else:
@@ -2401,6 +2545,7 @@ class EDT:
                             f"node '{node.path}' compatible '{compat}' "
                             f"has unknown vendor prefix '{vendor}'")
 
+                checked_compats.add(compat)
 
         for nodeset in self.scc_order:
             node = nodeset[0]
@@ -2429,21 +2574,25 @@ class EDT:
                         ', '.join(repr(x) for x in spec.enum))
 
         # Validate the contents of compatible properties.
-        for node in self.nodes:
-            if 'compatible' not in node.props:
-                continue
+        #
+        # This loop only holds assertions, so it's compiled out together
+        # with them when running with 'python -O'.
+        if __debug__:
+            for node in self.nodes:
+                if 'compatible' not in node.props:
+                    continue
 
-            compatibles = node.props['compatible'].val
+                compatibles = node.props['compatible'].val
 
-            # _check() runs after _init_compat2binding() has called
-            # _dt_compats(), which already converted every compatible
-            # property to a list of strings. So we know 'compatibles'
-            # is a list, but add an assert for future-proofing.
-            assert isinstance(compatibles, list)
+                # _check() runs after _finish_init() has called
+                # _check_dt(), which already converted every compatible
+                # property to a list of strings. So we know 'compatibles'
+                # is a list, but add an assert for future-proofing.
+                assert isinstance(compatibles, list)
 
-            for compat in compatibles:
-                # This is also just for future-proofing.
-                assert isinstance(compat, str)
+                for compat in compatibles:
+                    # This is also just for future-proofing.
+                    assert isinstance(compat, str)
 
 
 def bindings_from_paths(yaml_paths: List[str],
@@ -2457,9 +2606,10 @@ def bindings_from_paths(yaml_paths: List[str],
 
     ret = []
     fname2path = {os.path.basename(path): path for path in yaml_paths}
+    yaml_cache: Dict[str, Any] = {}
     for path in yaml_paths:
         try:
-            ret.append(Binding(path, fname2path))
+            ret.append(Binding(path, fname2path, yaml_cache=yaml_cache))
         except EDTError:
             if ignore_errors:
                 continue
@@ -2481,20 +2631,23 @@ def load_vendor_prefixes_txt(vendor_prefixes: str) -> Dict[str, str]:
     representation mapping a vendor prefix to the vendor name.
     """
     vnd2vendor: Dict[str, str] = {}
+    # The file is small, so it's read in one go rather than line by line
     with open(vendor_prefixes, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
+        contents = f.read()
 
-            if not line or line.startswith('#'):
-                # Comment or empty line.
-                continue
+    for line in contents.splitlines():
+        line = line.strip()
 
-            # Other lines should be in this form:
-            #
-            # <vnd><TAB><vendor>
-            vnd_vendor = line.split('\t', 1)
-            assert len(vnd_vendor) == 2, line
-            vnd2vendor[vnd_vendor[0]] = vnd_vendor[1]
+        if not line or line.startswith('#'):
+            # Comment or empty line.
+            continue
+
+        # Other lines should be in this form:
+        #
+        # <vnd><TAB><vendor>
+        vnd_vendor = line.split('\t', 1)
+        assert len(vnd_vendor) == 2, line
+        vnd2vendor[vnd_vendor[0]] = vnd_vendor[1]
     return vnd2vendor
 
 #
@@ -2502,27 +2655,40 @@ def load_vendor_prefixes_txt(vendor_prefixes: str) -> Dict[str, str]:
 #
 
 
-def _dt_compats(dt: DT) -> Set[str]:
-    # Returns a set() with all 'compatible' strings in the devicetree
-    # represented by dt (a dtlib.DT instance)
-
-    return {compat
-            for node in dt.node_iter()
-                if "compatible" in node.props
-                    for compat in node.props["compatible"].to_strings()}
-
-
 def _binding_paths(bindings_dirs: List[str]) -> List[str]:
     # Returns a list with the paths to all bindings (.yaml files) in
     # 'bindings_dirs'
 
     binding_paths = []
 
-    for bindings_dir in bindings_dirs:
-        for root, _, filenames in os.walk(bindings_dir):
-            for filename in filenames:
-                if filename.endswith(".yaml") or filename.endswith(".yml"):
-                    binding_paths.append(os.path.join(root, filename))
+    # This walks the directories with os.scandir() directly, in the same
+    # order as os.walk(): the files in a directory come before those in its
+    # subdirectories. It saves building the per-directory name lists and
+    # joining each name back onto its directory, as os.walk() does.
+    # Like os.walk(), unreadable directories are skipped, and symlinks to
+    # directories aren't followed.
+    dirs = list(reversed(bindings_dirs))
+    while dirs:
+        try:
+            entries = os.scandir(dirs.pop())
+        except OSError:
+            continue
+
+        with entries:
+            subdirs = []
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+
+                if is_dir:
+                    if not entry.is_symlink():
+                        subdirs.append(entry.path)
+                elif entry.name.endswith((".yaml", ".yml")):
+                    binding_paths.append(entry.path)
+
+        dirs.extend(reversed(subdirs))
 
     return binding_paths
 
@@ -2697,6 +2863,30 @@ def _bad_overwrite(to_dict: dict, from_dict: dict, prop: str,
     return True
 
 
+def _load_binding_yaml(path: str,
+                       yaml_cache: Optional[Dict[str, Any]] = None) -> Any:
+    # Returns the parsed YAML contents of the binding file at 'path'.
+    #
+    # Files like base.yaml are included by most bindings, so if 'yaml_cache'
+    # is given, parsed contents are kept there by path for the duration of
+    # a load. Callers then get a deep copy, since merging includes modifies
+    # the contents.
+
+    if yaml_cache is not None and path in yaml_cache:
+        return deepcopy(yaml_cache[path])
+
+    # The file is opened in binary mode, so that libyaml decodes the
+    # UTF-8 itself rather than getting it re-encoded from Python strs
+    with open(path, "rb") as f:
+        contents = yaml.load(f, Loader=_BindingLoader)
+
+    if yaml_cache is None:
+        return contents
+
+    yaml_cache[path] = contents
+    return deepcopy(contents)
+
+
 def _binding_include(loader, node):
     # Implements !include, for backwards compatibility. '!include [foo, bar]'
     # just becomes [foo, bar].
@@ -2853,25 +3043,26 @@ def _add_names(node: dtlib_Node, names_ident: str, objs: Any) -> None:
     #   The <foo> part of <foo>-names, e.g. "reg" for "reg-names"
     #
     # objs:
-    #   list of objects whose .name field should be set
+    #   list of objects whose .name field should be set. The objects are
+    #   expected to have been created with a None name, which is left as is
+    #   if there is no <foo>-names property.
 
     full_names_ident = names_ident + "-names"
 
-    if full_names_ident in node.props:
-        names = node.props[full_names_ident].to_strings()
-        if len(names) != len(objs):
-            _err(f"{full_names_ident} property in {node.path} "
-                 f"in {node.dt.filename} has {len(names)} strings, "
-                 f"expected {len(objs)} strings")
+    names_prop = node.props.get(full_names_ident)
+    if names_prop is None:
+        return
 
-        for obj, name in zip(objs, names):
-            if obj is None:
-                continue
-            obj.name = name
-    else:
-        for obj in objs:
-            if obj is not None:
-                obj.name = None
+    names = names_prop.to_strings()
+    if len(names) != len(objs):
+        _err(f"{full_names_ident} property in {node.path} "
+             f"in {node.dt.filename} has {len(names)} strings, "
+             f"expected {len(objs)} strings")
+
+    for obj, name in zip(objs, names):
+        if obj is None:
+            continue
+        obj.name = name
 
 
 def _interrupt_parent(start_node: dtlib_Node) -> dtlib_Node:
@@ -3014,9 +3205,11 @@ def _map(
     #   If True, the final controller node after mapping is required to have
     #   to have a <prefix>-controller property.
 
-    map_prop = parent.props.get(prefix + "-map")
+    map_name, controller_name, _, _ = _map_prop_names(prefix)
+
+    map_prop = parent.props.get(map_name)
     if not map_prop:
-        if require_controller and prefix + "-controller" not in parent.props:
+        if require_controller and controller_name not in parent.props:
             _err(f"expected '{prefix}-controller' property on {parent!r} "
                  f"(referenced by {child!r})")
 
@@ -3025,6 +3218,7 @@ def _map(
 
     masked_child_spec = _mask(prefix, child, parent, child_spec)
 
+    phandle2node = parent.dt.phandle2node
     raw = map_prop.value
     while raw:
         if len(raw) < len(child_spec):
@@ -3038,7 +3232,7 @@ def _map(
         raw = raw[4:]
 
         # Parent specified in *-map
-        map_parent = parent.dt.phandle2node.get(phandle)
+        map_parent = phandle2node.get(phandle)
         if not map_parent:
             _err(f"bad phandle ({phandle}) in {map_prop!r}")
 
@@ -3071,7 +3265,7 @@ def _mask(
     # Common code for handling <prefix>-mask properties, e.g. interrupt-mask.
     # See _map() for the parameters.
 
-    mask_prop = parent.props.get(prefix + "-map-mask")
+    mask_prop = parent.props.get(_map_prop_names(prefix)[2])
     if not mask_prop:
         # No mask
         return child_spec
@@ -3099,7 +3293,7 @@ def _pass_thru(
     #
     # See _map() for the other parameters.
 
-    pass_thru_prop = parent.props.get(prefix + "-map-pass-thru")
+    pass_thru_prop = parent.props.get(_map_prop_names(prefix)[3])
     if not pass_thru_prop:
         # No pass-thru
         return parent_spec
@@ -3116,6 +3310,21 @@ def _pass_thru(
     return res[-len(parent_spec):]
 
 
+def _map_prop_names(prefix: str) -> Tuple[str, str, str, str]:
+    # _map() helper. Returns the ('<prefix>-map', '<prefix>-controller',
+    # '<prefix>-map-mask', '<prefix>-map-pass-thru') property names for
+    # 'prefix', e.g. "interrupt" or "gpio". The names are cached in
+    # _MAP_PROP_NAMES, to avoid rebuilding the strings for each mapped
+    # specifier.
+
+    names = _MAP_PROP_NAMES.get(prefix)
+    if names is None:
+        names = _MAP_PROP_NAMES[prefix] = (
+            prefix + "-map", prefix + "-controller",
+            prefix + "-map-mask", prefix + "-map-pass-thru")
+    return names
+
+
 def _raw_unit_addr(node: dtlib_Node) -> bytes:
     # _map_interrupt() helper. Returns the unit address (derived from 'reg' and
     # #address-cells) as a raw 'bytes'
@@ -3156,8 +3365,7 @@ def _or(b1: bytes, b2: bytes) -> bytes:
 def _not(b: bytes) -> bytes:
     # Returns the bitwise not of the 'bytes' object 'b'
 
-    # ANDing with 0xFF avoids negative numbers
-    return bytes(~x & 0xFF for x in b)
+    return b.translate(_NOT_TABLE)
 
 
 def _phandle_val_list(
@@ -3183,15 +3391,20 @@ def _phandle_val_list(
 
     res: List[Optional[Tuple[dtlib_Node, bytes]]] = []
 
-    raw = prop.value
-    while raw:
-        if len(raw) < 4:
+    # Walk the value with an offset instead of repeatedly slicing off the
+    # front of it, which would copy the remainder of the value each time
+    phandle2node = prop.node.dt.phandle2node
+    raw = memoryview(prop.value)
+    end = len(raw)
+    offset = 0
+    while offset < end:
+        if offset + 4 > end:
             # Not enough room for phandle
             _err("bad value for " + repr(prop))
-        phandle = to_num(raw[:4])
-        raw = raw[4:]
+        phandle, = _UNPACK_U32(raw, offset)
+        offset += 4
 
-        node = prop.node.dt.phandle2node.get(phandle)
+        node = phandle2node.get(phandle)
         if not node:
             # Unspecified phandle-array element. This is valid; a 0
             # phandle value followed by no cells is an empty element.
@@ -3201,12 +3414,12 @@ def _phandle_val_list(
         if full_n_cells_name not in node.props:
             _err(f"{node!r} lacks {full_n_cells_name}")
 
-        n_cells = node.props[full_n_cells_name].to_num()
-        if len(raw) < 4*n_cells:
+        size = 4*node.props[full_n_cells_name].to_num()
+        if offset + size > end:
             _err("missing data after phandle in " + repr(prop))
 
-        res.append((node, raw[:4*n_cells]))
-        raw = raw[4*n_cells:]
+        res.append((node, bytes(raw[offset:offset + size])))
+        offset += size
 
     return res
 
@@ -3249,37 +3462,49 @@ def _slice(node: dtlib_Node,
     return _slice_helper(node, prop_name, size, size_hint, EDTError)
 
 
-def _check_dt(dt: DT) -> None:
+def _check_dt(dt: DT) -> Set[str]:
     # Does devicetree sanity checks. dtlib is meant to be general and
     # anything-goes except for very special properties like phandle, but in
     # edtlib we can be pickier.
+    #
+    # Since this has to visit every node anyway, it also returns a set() with
+    # all 'compatible' strings in the devicetree, saving a separate pass over
+    # the tree.
 
-    # Check that 'status' has one of the values given in the devicetree spec.
+    dt_compats: Set[str] = set()
 
-    # Accept "ok" for backwards compatibility
-    ok_status = {"ok", "okay", "disabled", "reserved", "fail", "fail-sss"}
+    # Check that 'status' has one of the values given in the devicetree spec.
+    # _OK_STATUS accepts "ok" for backwards compatibility.
 
     for node in dt.node_iter():
-        if "status" in node.props:
+        props = node.props
+
+        if "status" in props:
             try:
-                status_val = node.props["status"].to_string()
+                status_val = props["status"].to_string()
             except DTError as e:
                 # The error message gives the path
                 _err(str(e))
 
-            if status_val not in ok_status:
+            if status_val not in _OK_STATUS:
                 _err(f"unknown 'status' value \"{status_val}\" in {node.path} "
-                     f"in {node.dt.filename}, expected one of " +
-                     ", ".join(ok_status) +
+                     f"in {dt.filename}, expected one of " +
+                     ", ".join(_STATUS_ENUM) +
                      " (see the devicetree specification)")
 
-        ranges_prop = node.props.get("ranges")
+        ranges_prop = props.get("ranges")
         if ranges_prop:
             if ranges_prop.type not in (Type.EMPTY, Type.NUMS):
                 _err(f"expected 'ranges = < ... >;' in {node.path} in "
-                     f"{node.dt.filename}, not '{ranges_prop}' "
+                     f"{dt.filename}, not '{ranges_prop}' "
                      "(see the devicetree specification)")
 
+        compat_prop = props.get("compatible")
+        if compat_prop is not None:
+            dt_compats.update(compat_prop.to_strings())
+
+    return dt_compats
+
 
 def _err(msg) -> NoReturn:
     raise EDTError(msg)
@@ -3287,9 +3512,61 @@ def _err(msg) -> NoReturn:
 # Logging object
 _LOG = logging.getLogger(__name__)
 
+# Cache used by _map_prop_names(). Prefixes are added as they are first seen.
+_MAP_PROP_NAMES: Dict[str, Tuple[str, str, str, str]] = {}
+
+# Translation table for _not(), mapping each byte to its complement.
+# ANDing with 0xFF avoids negative numbers.
+_NOT_TABLE = bytes(~x & 0xFF for x in range(256))
+
+# Unpacks a big-endian <u32> cell at a given offset in a buffer
+_UNPACK_U32 = struct.Struct(">I").unpack_from
+
 # Regular expression for non-alphanumeric-or-underscore characters.
 _NOT_ALPHANUM_OR_UNDERSCORE = re.compile(r'\W', re.ASCII)
 
+# Translation table for str_as_token(), mapping the ASCII characters matched
+# by _NOT_ALPHANUM_OR_UNDERSCORE to underscores
+_TOKEN_TABLE = {c: '_' for c in range(128)
+                if not (chr(c).isalnum() or chr(c) == '_')}
+
+# Maps dtlib property types to the binding property types used for
+# inferred bindings, see Node._binding_from_properties()
+_DT_TYPE2BINDING_TYPE: Dict[Type, str] = {
+    Type.EMPTY: "boolean",
+    Type.BYTES: "uint8-array",
+    Type.NUM: "int",
+    Type.NUMS: "array",
+    Type.STRING: "string",
+    Type.STRINGS: "string-array",
+    Type.PHANDLE: "phandle",
+    Type.PHANDLES: "phandles",
+    Type.PHANDLES_AND_NUMS: "phandle-array",
+    Type.PATH: "path",
+}
+
+# Maps binding property types to the dtlib.Property methods that convert
+# property values to them, for the types that need no further processing.
+# See Node._prop_val().
+_PROP_TYPE2TO_VAL: Dict[str, Callable[[dtlib_Property], PropertyValType]] = {
+    "int": dtlib_Property.to_num,
+    "array": dtlib_Property.to_nums,
+    "uint8-array": dtlib_Property.to_bytes,
+    "string": dtlib_Property.to_string,
+    "string-array": dtlib_Property.to_strings,
+}
+
+# Regular expression that 'compatible' strings must match, see
+# EDT._init_luts(). It comes from dt-schema.
+_COMPAT_RE = re.compile(r'^[a-zA-Z][a-zA-Z0-9,+\-._]+$')
+
+# Regular expression for runs of the characters allowed in 'compatible'
+# strings. See EDT._init_compat2binding().
+_COMPAT_CHARS_RE = re.compile(r'[a-zA-Z0-9,+\-._]+')
+
+# Regular expression for pinctrl-<index> property names
+_PINCTRL_PROP_RE = re.compile("pinctrl-[0-9]+")
+
 
 def str_as_token(val: str) -> str:
     """Return a canonical representation of a string as a C token.
@@ -3297,12 +3574,17 @@ def str_as_token(val: str) -> str:
     This converts special characters in 'val' to underscores, and
     returns the result."""
 
-    return re.sub(_NOT_ALPHANUM_OR_UNDERSCORE, '_', val)
+    # str.translate() is much faster than a regular expression
+    # substitution. Non-ASCII characters, which the table doesn't cover,
+    # are rare enough to leave to the regular expression.
+    if val.isascii():
+        return val.translate(_TOKEN_TABLE)
+    return _NOT_ALPHANUM_OR_UNDERSCORE.sub('_', val)
 
 
-# Custom PyYAML binding loader class to avoid modifying yaml.Loader directly,
-# which could interfere with YAML loading in clients
-class _BindingLoader(Loader):
+# Custom PyYAML binding loader class to avoid modifying yaml.SafeLoader
+# directly, which could interfere with YAML loading in clients
+class _BindingLoader(SafeLoader):
     pass
 
 
@@ -3332,6 +3614,9 @@ _DEFAULT_PROP_TYPES: Dict[str, str] = {
 
 _STATUS_ENUM: List[str] = "ok okay disabled reserved fail fail-sss".split()
 
+# Valid 'status' values, for checking nodes in _check_dt()
+_OK_STATUS: FrozenSet[str] = frozenset(_STATUS_ENUM)
+
 def _raw_default_property_for(
         name: str
 ) -> Dict[str, Union[str, bool, List[str]]]:
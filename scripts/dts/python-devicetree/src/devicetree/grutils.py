@@ -6,8 +6,6 @@
 # [PyXB](https://github.com/pabigot/pyxb), stripped down and modified
 # specifically to manage edtlib Node instances.
 
-import collections
-
 class Graph:
     """
     Represent a directed graph with edtlib Node objects as nodes.
@@ -22,15 +20,25 @@ class Graph:
         self.__roots = None
         if root is not None:
             self.__roots = {root}
-        self.__edge_map = collections.defaultdict(set)
-        self.__reverse_map = collections.defaultdict(set)
-        self.__nodes = set()
+        # Plain dicts rather than defaultdicts, so that lookups of nodes
+        # without edges don't create empty sets as a side effect
+        self.__edge_map = {}
+        self.__reverse_map = {}
+        # Used as an insertion-ordered set, to make iteration order
+        # deterministic
+        self.__nodes = {}
+        # Caches of the sorted contents of __edge_map and __reverse_map,
+        # filled in on demand
+        self.__sorted_edge_map = {}
+        self.__sorted_reverse_map = {}
+        # Cache of node_key() values, see _node_key()
+        self.__node_keys = {}
 
     def add_node(self, node):
         """
         Add a node without any target to the graph.
         """
-        self.__nodes.add(node)
+        self.__nodes[node] = None
 
     def add_edge(self, source, target):
         """
@@ -38,11 +46,55 @@ class Graph:
 
         The nodes are added to the graph if necessary.
         """
-        self.__edge_map[source].add(target)
+        targets = self.__edge_map.get(source)
+        if targets is None:
+            targets = self.__edge_map[source] = set()
+        elif target in targets:
+            # Edge already present. Nodes often depend on the same node
+            # through several properties.
+            return
+
+        targets.add(target)
+        self.__sorted_edge_map.pop(source, None)
         if source != target:
-            self.__reverse_map[target].add(source)
-        self.__nodes.add(source)
-        self.__nodes.add(target)
+            sources = self.__reverse_map.get(target)
+            if sources is None:
+                sources = self.__reverse_map[target] = set()
+            sources.add(source)
+            self.__sorted_reverse_map.pop(target, None)
+        self.__nodes[source] = None
+        self.__nodes[target] = None
+
+    def add_edges(self, source, targets):
+        """
+        Add directed edges from C{source} to each node in C{targets}.
+
+        This is equivalent to calling add_edge() for each target, but
+        only does the per-source bookkeeping once.
+        """
+        source_targets = self.__edge_map.get(source)
+        if source_targets is None:
+            source_targets = self.__edge_map[source] = set()
+        reverse_map = self.__reverse_map
+        sorted_reverse_map = self.__sorted_reverse_map
+        nodes = self.__nodes
+        nodes[source] = None
+
+        n_targets = len(source_targets)
+        for target in targets:
+            if target in source_targets:
+                continue
+            source_targets.add(target)
+            if source != target:
+                sources = reverse_map.get(target)
+                if sources is None:
+                    sources = reverse_map[target] = set()
+                sources.add(source)
+                sorted_reverse_map.pop(target, None)
+            nodes[target] = None
+
+        if len(source_targets) != n_targets:
+            self.__sorted_edge_map.pop(source, None)
 
     def roots(self):
         """
@@ -74,54 +126,85 @@ class Graph:
         # based on dependencies.
 
         self.__stack = []
+        # Nodes in __stack, for constant-time membership tests
+        self.__on_stack = set()
         self.__scc_order = []
         self.__index = 0
+        # Next dep_ordinal to assign
+        self.__ordinal = 0
         self.__tarjan_index = {}
         self.__tarjan_low_link = {}
         for v in self.__nodes:
             self.__tarjan_index[v] = None
-        roots = sorted(self.roots(), key=node_key)
+        roots = sorted(self.roots(), key=self._node_key)
         if self.__nodes and not roots:
             raise Exception('TARJAN: No roots found in graph with {} nodes'.format(len(self.__nodes)))
 
         for r in roots:
             self._tarjan_root(r)
 
-        # Assign ordinals for edtlib
-        ordinal = 0
-        for scc in self.__scc_order:
-            # Zephyr customization: devicetree Node graphs should have
-            # no loops, so all SCCs should be singletons.  That may
-            # change in the future, but for now we only give an
-            # ordinal to singletons.
-            if len(scc) == 1:
-                scc[0].dep_ordinal = ordinal
-                ordinal += 1
-
     def _tarjan_root(self, v):
         # Do the work of Tarjan's algorithm for a given root node.
+        #
+        # This uses an explicit stack of (node, targets) frames instead
+        # of recursion, so that long dependency chains can neither hit
+        # the interpreter's recursion limit nor pay for a Python call per
+        # edge.
 
         if self.__tarjan_index.get(v) is not None:
             # "Root" was already reached.
             return
-        self.__tarjan_index[v] = self.__tarjan_low_link[v] = self.__index
-        self.__index += 1
-        self.__stack.append(v)
-        source = v
-        for target in sorted(self.__edge_map[source], key=node_key):
-            if self.__tarjan_index[target] is None:
-                self._tarjan_root(target)
-                self.__tarjan_low_link[v] = min(self.__tarjan_low_link[v], self.__tarjan_low_link[target])
-            elif target in self.__stack:
-                self.__tarjan_low_link[v] = min(self.__tarjan_low_link[v], self.__tarjan_low_link[target])
-
-        if self.__tarjan_low_link[v] == self.__tarjan_index[v]:
-            scc = []
-            while True:
-                scc.append(self.__stack.pop())
-                if v == scc[-1]:
+
+        tarjan_index = self.__tarjan_index
+        low_link = self.__tarjan_low_link
+        stack = self.__stack
+        on_stack = self.__on_stack
+
+        def visit(node):
+            tarjan_index[node] = low_link[node] = self.__index
+            self.__index += 1
+            stack.append(node)
+            on_stack.add(node)
+            work.append((node, iter(self._sorted_targets(node))))
+
+        work = []
+        visit(v)
+        while work:
+            source, targets = work[-1]
+            for target in targets:
+                if tarjan_index[target] is None:
+                    # Descend into 'target'; 'source' is resumed when
+                    # the frame for 'target' is done.
+                    visit(target)
                     break
-            self.__scc_order.append(scc)
+                if target in on_stack:
+                    low_link[source] = min(low_link[source], low_link[target])
+            else:
+                # All targets of 'source' have been handled
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low_link[parent] = min(low_link[parent], low_link[source])
+
+                if low_link[source] == tarjan_index[source]:
+                    scc = []
+                    while True:
+                        scc.append(stack.pop())
+                        on_stack.remove(scc[-1])
+                        if source == scc[-1]:
+                            break
+                    self.__scc_order.append(scc)
+
+                    # Assign ordinals for edtlib as SCCs are completed,
+                    # which is already in dependency order.
+                    #
+                    # Zephyr customization: devicetree Node graphs should
+                    # have no loops, so all SCCs should be singletons.
+                    # That may change in the future, but for now we only
+                    # give an ordinal to singletons.
+                    if len(scc) == 1:
+                        source.dep_ordinal = self.__ordinal
+                        self.__ordinal += 1
 
     def scc_order(self):
         """Return the strongly-connected components in order.
@@ -140,11 +223,41 @@ class Graph:
 
     def depends_on(self, node):
         """Get the nodes that 'node' directly depends on."""
-        return sorted(self.__edge_map[node], key=node_key)
+        return list(self._sorted_targets(node))
 
     def required_by(self, node):
         """Get the nodes that directly depend on 'node'."""
-        return sorted(self.__reverse_map[node], key=node_key)
+        return list(self._sorted_sources(node))
+
+    def _sorted_targets(self, node):
+        # Returns the targets of the edges from 'node', sorted by
+        # node_key(). The list is cached until an edge is added from
+        # 'node', so it must not be modified by callers.
+
+        targets = self.__sorted_edge_map.get(node)
+        if targets is None:
+            targets = self.__sorted_edge_map[node] = \
+                sorted(self.__edge_map.get(node, ()), key=self._node_key)
+        return targets
+
+    def _sorted_sources(self, node):
+        # Like _sorted_targets(), for the sources of the edges to 'node'
+
+        sources = self.__sorted_reverse_map.get(node)
+        if sources is None:
+            sources = self.__sorted_reverse_map[node] = \
+                sorted(self.__reverse_map.get(node, ()), key=self._node_key)
+        return sources
+
+    def _node_key(self, node):
+        # Memoized node_key(). Computing the key reads the node's parent
+        # path and unit address, which are comparatively expensive edtlib
+        # properties, and every node gets sorted many times.
+
+        key = self.__node_keys.get(node)
+        if key is None:
+            key = self.__node_keys[node] = node_key(node)
+        return key
 
 def node_key(node):
     # This sort key ensures that sibling nodes with the same name will
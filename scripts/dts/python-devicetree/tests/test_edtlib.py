@@ -393,6 +393,33 @@ def test_include_filters_included_bindings():
     assert not top_blocks.prop2specs.get("x")
     assert top_blocks.prop2specs.get("y")
 
+def test_include_file_changes(tmp_path):
+    '''Test that changes to included files are picked up on reload.'''
+
+    inc_file = tmp_path / "inc.yaml"
+    top_file = tmp_path / "top.yaml"
+    fname2path = {'inc.yaml': str(inc_file)}
+
+    top_file.write_text("description: top\ninclude: inc.yaml\n",
+                        encoding="utf-8")
+
+    inc_file.write_text("properties:\n  x:\n    type: int\n",
+                        encoding="utf-8")
+    top = edtlib.Binding(str(top_file), fname2path, require_compatible=False)
+    assert set(top.prop2specs.keys()) == {'x'}
+
+    inc_file.write_text("properties:\n  yy:\n    type: string\n",
+                        encoding="utf-8")
+    top = edtlib.Binding(str(top_file), fname2path, require_compatible=False)
+    assert set(top.prop2specs.keys()) == {'yy'}
+    assert top.prop2specs['yy'].type == 'string'
+
+    # An edit that keeps the file size the same is picked up too
+    inc_file.write_text("properties:\n  zz:\n    type: string\n",
+                        encoding="utf-8")
+    top = edtlib.Binding(str(top_file), fname2path, require_compatible=False)
+    assert set(top.prop2specs.keys()) == {'zz'}
+
 
 
 def test_bus():
@@ -600,6 +627,29 @@ def test_prop_enums():
     assert not no_enum.spec.enum_tokenizable
     assert not no_enum.spec.enum_upper_tokenizable
 
+def test_prop_enum_mismatch(tmp_path):
+    '''Test values that aren't in the binding's enum: list'''
+
+    dts_file = tmp_path / "enums.dts"
+    for prop, expected in (('int-enum = <4>;', "(4) is not in 'enum' list"),
+                           ('string-enum = "foo";',
+                            "('foo') is not in 'enum' list")):
+        with open(dts_file, "w", encoding="utf-8") as f:
+            f.write(f"""
+/dts-v1/;
+
+/ {{
+	enums {{
+		compatible = "enums";
+		{prop}
+	}};
+}};
+""")
+
+        with from_here(), pytest.raises(edtlib.EDTError) as e:
+            edtlib.EDT(dts_file, ["test-bindings"])
+        assert expected in str(e.value)
+
 def test_binding_inference():
     '''Test inferred bindings for special zephyr-specific nodes.'''
     warnings = io.StringIO()
@@ -670,6 +720,101 @@ def test_child_dependencies():
     assert edt.get_node("/child-binding/child-1/grandchild") in dep_node.required_by
     assert edt.get_node("/child-binding/child-2") in dep_node.required_by
 
+def test_chosen_nodes(tmp_path):
+    '''Test EDT.chosen_nodes and EDT.chosen_node()'''
+
+    dts_file = tmp_path / "chosen.dts"
+    with open(dts_file, "w", encoding="utf-8") as f:
+        f.write("""
+/dts-v1/;
+
+/ {
+	chosen {
+		zephyr,by-ref = &{/foo};
+		zephyr,by-path = "/foo";
+		zephyr,missing = "/bar";
+		zephyr,number = <1>;
+	};
+	foo {
+	};
+};
+""")
+
+    edt = edtlib.EDT(dts_file, [])
+    foo = edt.get_node("/foo")
+    assert edt.chosen_nodes == {"zephyr,by-ref": foo, "zephyr,by-path": foo}
+    assert edt.chosen_node("zephyr,by-path") is foo
+    assert edt.chosen_node("zephyr,missing") is None
+    assert edt.chosen_node("zephyr,number") is None
+    assert edt.chosen_node("zephyr,undefined") is None
+
+    with open(dts_file, "w", encoding="utf-8") as f:
+        f.write("/dts-v1/; / { };")
+
+    edt = edtlib.EDT(dts_file, [])
+    assert edt.chosen_nodes == {}
+    assert edt.chosen_node("zephyr,by-path") is None
+
+def test_aliases(tmp_path):
+    '''Test Node.aliases'''
+
+    dts_file = tmp_path / "aliases.dts"
+    with open(dts_file, "w", encoding="utf-8") as f:
+        f.write("""
+/dts-v1/;
+
+/ {
+	aliases {
+		foo-a = &{/foo};
+		bar = "/bar";
+		foo-b = "/foo";
+	};
+	foo {
+	};
+	bar {
+	};
+	baz {
+	};
+};
+""")
+
+    edt = edtlib.EDT(dts_file, [])
+    assert edt.get_node("/foo").aliases == ["foo-a", "foo-b"]
+    assert edt.get_node("/bar").aliases == ["bar"]
+    assert edt.get_node("/baz").aliases == []
+
+def test_vendor_prefix_warnings(caplog, tmp_path):
+    '''Test that unknown vendor prefixes are reported once per compatible'''
+
+    dts_file = tmp_path / "vendors.dts"
+    with open(dts_file, "w", encoding="utf-8") as f:
+        f.write("""
+/dts-v1/;
+
+/ {
+	compatible = "unknown,board";
+	foo {
+		compatible = "unknown,dev";
+	};
+	bar {
+		compatible = "unknown,dev";
+	};
+	baz {
+		compatible = "unknown,board";
+	};
+};
+""")
+
+    edt = edtlib.EDT(dts_file, [], vendor_prefixes={'test-vnd': 'A test vendor'})
+    assert caplog.record_tuples == [
+        ('devicetree.edtlib', WARNING,
+         "node '/foo' compatible 'unknown,dev' has unknown vendor prefix 'unknown'"),
+        ('devicetree.edtlib', WARNING,
+         "node '/baz' compatible 'unknown,board' has unknown vendor prefix 'unknown'"),
+    ]
+    assert edt.compat2nodes["unknown,dev"] == [edt.get_node("/foo"),
+                                               edt.get_node("/bar")]
+
 def test_slice_errs(tmp_path):
     '''Test error messages from the internal _slice() helper'''
 
@@ -822,8 +967,12 @@ def test_deepcopy():
     assert edt_copy._vendor_prefixes is not edt._vendor_prefixes
     assert edt_copy._werror
     test_equal_but_not_same("_compat2binding", equal_key2path)
+    for key, binding in edt_copy._compat2binding.items():
+        assert binding is not edt._compat2binding[key]
+        assert binding._fname2path is edt_copy._binding_fname2path
     test_equal_but_not_same("_binding_paths")
     test_equal_but_not_same("_binding_fname2path")
+    test_equal_but_not_same("_path2node", equal_key2path)
     assert len(edt_copy._node2enode) == len(edt._node2enode)
     for node1, node2 in zip(edt_copy._node2enode, edt._node2enode):
         enode1 = edt_copy._node2enode[node1]